@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
+from numba import njit
+from pandas.api.types import union_categoricals
 
 st.set_page_config(page_title="Influencer Campaign Dashboard", layout="wide")
 
@@ -9,11 +12,40 @@ st.set_page_config(page_title="Influencer Campaign Dashboard", layout="wide")
 # ---------------------------
 @st.cache_data
 def load_data():
-    influencers = pd.read_csv('data/influencers.csv')
-    posts = pd.read_csv('data/posts.csv', parse_dates=['date'])
-    tracking = pd.read_csv('data/tracking.csv', parse_dates=['date'])
-    payouts = pd.read_csv('data/payouts.csv')
-    return influencers, posts, tracking, payouts
+    influencers = pd.read_parquet('data/influencers.parquet', engine='pyarrow')
+    posts = pd.read_parquet('data/posts.parquet', engine='pyarrow')
+    tracking = pd.read_parquet('data/tracking.parquet', engine='pyarrow')
+    payouts = pd.read_parquet('data/payouts.parquet', engine='pyarrow')
+
+    # Narrow numeric columns; value ranges fit and sums upcast on reduction
+    posts = posts.astype({'reach': 'int32', 'likes': 'int32', 'comments': 'int32'})
+    tracking = tracking.astype({'orders': 'uint8', 'revenue': 'int32'})
+
+    # Low-cardinality labels as categoricals; platform shares one dtype across frames
+    for c in ['platform', 'category']:
+        influencers[c] = influencers[c].astype('category')
+    posts['platform'] = posts['platform'].astype('category')
+    platform_dtype = pd.CategoricalDtype(
+        union_categoricals([influencers['platform'], posts['platform']], ignore_order=True).categories
+    )
+    influencers['platform'] = influencers['platform'].astype(platform_dtype)
+    posts['platform'] = posts['platform'].astype(platform_dtype)
+    for c in ['source', 'product']:
+        tracking[c] = tracking[c].astype('category')
+
+    # Date-sorted so the date range filter is a binary-searched slice
+    posts = posts.sort_values('date', kind='stable').reset_index(drop=True)
+    tracking = tracking.sort_values('date', kind='stable').reset_index(drop=True)
+
+    payouts_indexed = payouts.set_index('influencer_id')
+
+    # Influencer attributes and spend keyed by influencer_id for reindex lookups
+    inf_meta = (
+        influencers.set_index('id')
+        .rename_axis('influencer_id')
+        .join(payouts_indexed[['total_payout']])
+    )
+    return influencers, posts, tracking, payouts, inf_meta
 
 
 # ---------------------------
@@ -27,68 +59,177 @@ def calculate_roas(tracking_f, payouts):
     return total_rev, total_orders, total_spend, roas
 
 
-def calculate_iroas(tracking_f, payouts):
-    organic = tracking_f[tracking_f['source'] == 'organic']
-    baseline = organic.groupby('product').agg(
-        org_users=('user_id', 'nunique'),
-        org_revenue=('revenue', 'sum')
-    ).reset_index()
-    baseline['rev_per_user'] = baseline['org_revenue'] / baseline['org_users']
+@njit(cache=True)
+def _popcount64(x):
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+@njit(cache=True)
+def _count_bits(bits):
+    total = 0
+    for w in range(bits.shape[0]):
+        total += np.int64(_popcount64(bits[w]))
+    return total
+
 
-    inf_perf = tracking_f[tracking_f['source'] == 'influencer'].groupby(
-        ['influencer_id', 'product']
-    ).agg(
-        inf_users=('user_id', 'nunique'),
-        inf_revenue=('revenue', 'sum')
-    ).reset_index()
+@njit(cache=True)
+def _iroas_kernel(org_prod, org_user, org_revenue, inf_codes, inf_prod, inf_user, inf_revenue,
+                  n_inf, n_prod, n_users):
+    n_groups = n_inf * n_prod
+    n_words = (n_users + 63) >> 6
+    org_rev = np.zeros(n_prod, dtype=np.int64)
+    org_bits = np.zeros((n_prod, n_words), dtype=np.uint64)
+    inf_rev = np.zeros(n_groups, dtype=np.int64)
+    inf_bits = np.zeros((n_groups, n_words), dtype=np.uint64)
+
+    # Organic baseline per product and influencer totals per (influencer, product),
+    # with distinct users packed 64 per word
+    for r in range(org_revenue.shape[0]):
+        p = org_prod[r]
+        u = org_user[r]
+        org_rev[p] += org_revenue[r]
+        org_bits[p, u >> 6] |= np.uint64(1) << np.uint64(u & 63)
+    for r in range(inf_revenue.shape[0]):
+        if inf_codes[r] < 0:
+            continue
+        g = inf_codes[r] * n_prod + inf_prod[r]
+        u = inf_user[r]
+        inf_rev[g] += inf_revenue[r]
+        inf_bits[g, u >> 6] |= np.uint64(1) << np.uint64(u & 63)
+
+    org_users = np.zeros(n_prod, dtype=np.int64)
+    for p in range(n_prod):
+        org_users[p] = _count_bits(org_bits[p])
+
+    inf_users = np.zeros(n_groups, dtype=np.int64)
+    rev_per_user = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        p = g % n_prod
+        inf_users[g] = _count_bits(inf_bits[g])
+        if org_users[p] > 0:
+            rev_per_user[g] = org_rev[p] / org_users[p]
+    return inf_users, inf_rev, rev_per_user
+
+
+@st.cache_data(max_entries=16)
+def calculate_iroas(_tf_inf, _tf_org, _inf_meta, filter_key):
+    inf_codes, inf_uniques = pd.factorize(_tf_inf['influencer_id'], sort=True)
+    user_codes, user_uniques = pd.factorize(
+        np.concatenate([_tf_org['user_id'].to_numpy(), _tf_inf['user_id'].to_numpy()])
+    )
+    user_codes = user_codes.astype(np.int64)
+    products = _tf_inf['product'].cat.categories
+    spend = (
+        _inf_meta['total_payout']
+        .reindex(inf_uniques)
+        .to_numpy(dtype=np.float64, na_value=np.nan)
+    )
+
+    inf_users, inf_rev, rev_per_user = _iroas_kernel(
+        _tf_org['product'].cat.codes.to_numpy().astype(np.int64),
+        user_codes[:len(_tf_org)],
+        _tf_org['revenue'].to_numpy(),
+        inf_codes.astype(np.int64),
+        _tf_inf['product'].cat.codes.to_numpy().astype(np.int64),
+        user_codes[len(_tf_org):],
+        _tf_inf['revenue'].to_numpy(),
+        len(inf_uniques),
+        len(products),
+        len(user_uniques),
+    )
 
-    inf_perf = inf_perf.merge(baseline[['product', 'rev_per_user']], on='product', how='left')
+    # Keep only observed (influencer, product) groups, ordered by influencer then product
+    g = np.flatnonzero(inf_users)
+    inf_idx, prod_idx = np.divmod(g, len(products))
+    inf_perf = pd.DataFrame({
+        'influencer_id': np.asarray(inf_uniques)[inf_idx],
+        'product': pd.Categorical.from_codes(prod_idx, dtype=_tf_inf['product'].dtype),
+        'inf_users': inf_users[g],
+        'inf_revenue': inf_rev[g],
+        'rev_per_user': rev_per_user[g],
+    })
     inf_perf['expected_baseline_rev'] = inf_perf['rev_per_user'] * inf_perf['inf_users']
     inf_perf['incremental_revenue'] = inf_perf['inf_revenue'] - inf_perf['expected_baseline_rev']
-
-    inf_spend = payouts[['influencer_id', 'total_payout']]
-    inf_perf = inf_perf.merge(inf_spend, on='influencer_id', how='left')
+    inf_perf['total_payout'] = spend[inf_idx]
     inf_perf['iROAS'] = inf_perf['incremental_revenue'] / (inf_perf['total_payout'] + 1e-9)
 
+    # Per-influencer rollup for the iROAS table
+    iroas_table = (
+        inf_perf.groupby('influencer_id', observed=True, sort=False).agg(
+            total_incremental_rev=('incremental_revenue', 'sum'),
+            spend=('total_payout', 'mean'),
+            iROAS=('iROAS', 'mean')
+        )
+        .join(_inf_meta[['name', 'category', 'platform']], how='inner')
+        [['name', 'category', 'platform', 'total_incremental_rev', 'spend', 'iROAS']]
+        .sort_values('iROAS', ascending=False)
+        .reset_index(drop=True)
+    )
+
     overall_iroas = inf_perf['iROAS'].mean()
-    return inf_perf, overall_iroas
+    return overall_iroas, iroas_table
 
 
 # ---------------------------
 # Top Influencers Table
 # ---------------------------
-def get_top_influencers(tracking_f, posts_f, payouts, influencers, top_n):
-    top_inf = (
-        tracking_f[tracking_f['source'] == 'influencer']
-        .groupby('influencer_id')
+@st.cache_data(max_entries=16)
+def get_top_influencers(_tf_inf, _posts_f, _inf_meta, filter_key, top_n):
+    inf_totals = (
+        _tf_inf
+        .groupby('influencer_id', observed=True, sort=False)
         .agg(
             revenue=('revenue', 'sum'),
             orders=('orders', 'sum')
         )
-        .reset_index()
-        .merge(influencers, left_on='influencer_id', right_on='id')
     )
+    # influencer_id breaks revenue ties so the cutoff does not depend on row order
+    top = inf_totals.sort_values(['revenue', 'influencer_id'], ascending=[False, True]).head(top_n)
 
-    post_metrics = posts_f.groupby('influencer_id').agg(
+    post_metrics = _posts_f.groupby('influencer_id', observed=True, sort=False).agg(
         total_likes=('likes', 'sum'),
         total_comments=('comments', 'sum'),
         total_reach=('reach', 'sum')
-    ).reset_index()
+    )
     post_metrics['engagement_rate'] = (
         (post_metrics['total_likes'] + post_metrics['total_comments']) / post_metrics['total_reach']
     )
 
-    top_inf = top_inf.merge(post_metrics[['influencer_id', 'engagement_rate']], on='influencer_id', how='left')
-    top_inf = top_inf.merge(payouts[['influencer_id', 'total_payout']], on='influencer_id', how='left')
+    top_inf = _inf_meta.reindex(top.index).assign(
+        revenue=top['revenue'],
+        orders=top['orders'],
+        engagement_rate=post_metrics['engagement_rate']
+    )
     top_inf['cost_per_order'] = top_inf['total_payout'] / (top_inf['orders'] + 1e-9)
 
-    return top_inf.sort_values('revenue', ascending=False).head(top_n)
+    return top_inf.reset_index()
+
+
+# ---------------------------
+# Revenue Over Time
+# ---------------------------
+@st.cache_data(max_entries=16)
+def compute_rev_time(_tracking_f, filter_key):
+    return _tracking_f.groupby('date', observed=True, sort=False)['revenue'].sum().reset_index()
+
+
+# ---------------------------
+# Date Filtering
+# ---------------------------
+def slice_by_date(df, start_date, end_date):
+    # df must be sorted by 'date' (see load_data)
+    lo = df['date'].searchsorted(pd.Timestamp(start_date))
+    hi = df['date'].searchsorted(pd.Timestamp(end_date), side='right')
+    return df.iloc[lo:hi]
 
 
 # ---------------------------
 # Main App
 # ---------------------------
-influencers, posts, tracking, payouts = load_data()
+influencers, posts, tracking, payouts, inf_meta = load_data()
 
 # Sidebar Filters
 st.sidebar.header("Filters")
@@ -105,38 +246,30 @@ category_filter = st.sidebar.multiselect(
 top_n = st.sidebar.slider("Show Top N Influencers", min_value=5, max_value=20, value=10)
 
 # Filter Tracking
-tracking_f = tracking[
-    (tracking['date'] >= pd.to_datetime(start_date)) &
-    (tracking['date'] <= pd.to_datetime(end_date))
-].merge(
-    influencers[['id', 'platform', 'category']],
-    left_on='influencer_id',
-    right_on='id',
-    how='left'
+tracking_f = slice_by_date(tracking, start_date, end_date).join(
+    inf_meta[['platform', 'category']], on='influencer_id'
 )
-tracking_f = tracking_f[
-    (tracking_f['platform'].isin(platform_filter)) &
-    (tracking_f['category'].isin(category_filter))
-]
+mask = tracking_f['platform'].isin(platform_filter) & tracking_f['category'].isin(category_filter)
+tracking_f = tracking_f.iloc[mask.to_numpy().nonzero()[0]]
+
+# Cache key for the derived views; the filtered frames follow from it and are passed unhashed
+filter_key = (start_date, end_date, tuple(platform_filter), tuple(category_filter))
+
+# Split once by source for the iROAS and top-influencer views
+source = tracking_f['source']
+tf_inf = tracking_f[source.eq('influencer')]
+tf_org = tracking_f[source.eq('organic')]
 
 # Filter Posts
-posts_f = posts[
-    (posts['date'] >= pd.to_datetime(start_date)) &
-    (posts['date'] <= pd.to_datetime(end_date))
-].merge(
-    influencers[['id', 'category']],
-    left_on='influencer_id',
-    right_on='id',
-    how='left'
+posts_f = slice_by_date(posts, start_date, end_date).join(
+    inf_meta[['category']], on='influencer_id'
 )
-posts_f = posts_f[
-    (posts_f['platform'].isin(platform_filter)) &
-    (posts_f['category'].isin(category_filter))
-]
+mask = posts_f['platform'].isin(platform_filter) & posts_f['category'].isin(category_filter)
+posts_f = posts_f.iloc[mask.to_numpy().nonzero()[0]]
 
 # KPIs
 total_rev, total_orders, total_spend, roas = calculate_roas(tracking_f, payouts)
-inf_perf, overall_iroas = calculate_iroas(tracking_f, payouts)
+overall_iroas, iroas_table = calculate_iroas(tf_inf, tf_org, inf_meta, filter_key)
 
 # KPI Display
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -147,21 +280,19 @@ col4.metric("ROAS", f"{roas:.2f}")
 col5.metric("Avg iROAS", f"{overall_iroas:.2f}")
 
 # Top Influencers
-top_inf = get_top_influencers(tracking_f, posts_f, payouts, influencers, top_n)
+top_inf = get_top_influencers(tf_inf, posts_f, inf_meta, filter_key, top_n)
 st.subheader(f"Top {top_n} Influencers by Revenue")
 
 # Conditional Formatting
-def highlight_cells(val, good_thresh=0.3, bad_thresh=0.1):
-    color = ""
-    if isinstance(val, (float, int)):
-        if val >= good_thresh:
-            color = 'background-color: #d4edda'  # green
-        elif val <= bad_thresh:
-            color = 'background-color: #f8d7da'  # red
-    return color
-
-styled_top_inf = top_inf[['name', 'platform', 'category', 'revenue', 'orders', 'engagement_rate', 'cost_per_order']].style.applymap(
-    lambda x: highlight_cells(x, good_thresh=0.05, bad_thresh=0.02), subset=['engagement_rate']
+def highlight_cells(col, good_thresh=0.3, bad_thresh=0.1):
+    return np.where(
+        col >= good_thresh,
+        'background-color: #d4edda',  # green
+        np.where(col <= bad_thresh, 'background-color: #f8d7da', '')  # red
+    )
+
+styled_top_inf = top_inf[['name', 'platform', 'category', 'revenue', 'orders', 'engagement_rate', 'cost_per_order']].style.apply(
+    lambda col: highlight_cells(col, good_thresh=0.05, bad_thresh=0.02), subset=['engagement_rate']
 )
 
 st.dataframe(styled_top_inf, use_container_width=True)
@@ -175,7 +306,7 @@ st.download_button(
 )
 
 # Revenue Over Time Chart
-rev_time = tracking_f.groupby('date')['revenue'].sum().reset_index()
+rev_time = compute_rev_time(tracking_f, filter_key)
 chart = alt.Chart(rev_time).mark_line(point=True).encode(
     x='date:T',
     y='revenue:Q',
@@ -185,18 +316,8 @@ st.altair_chart(chart)
 
 # iROAS Table
 st.subheader("Incremental ROAS by Influencer")
-iroas_table = (
-    inf_perf.groupby('influencer_id').agg(
-        total_incremental_rev=('incremental_revenue', 'sum'),
-        spend=('total_payout', 'mean'),
-        iROAS=('iROAS', 'mean')
-    ).reset_index()
-    .merge(influencers, left_on='influencer_id', right_on='id')
-    [['name', 'category', 'platform', 'total_incremental_rev', 'spend', 'iROAS']]
-    .sort_values('iROAS', ascending=False)
-)
-styled_iroas = iroas_table.style.applymap(
-    lambda x: highlight_cells(x, good_thresh=2, bad_thresh=1), subset=['iROAS']
+styled_iroas = iroas_table.style.apply(
+    lambda col: highlight_cells(col, good_thresh=2, bad_thresh=1), subset=['iROAS']
 )
 st.dataframe(styled_iroas, use_container_width=True)
 
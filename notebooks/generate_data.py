@@ -3,7 +3,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 
-np.random.seed(42)
+rng = np.random.default_rng(42)
 os.makedirs("data", exist_ok=True)
 
 # -------------------------------
@@ -15,22 +15,23 @@ inf_ids = np.arange(1, n_inf + 1)
 influencers = pd.DataFrame({
     'id': inf_ids,
     'name': [f'Influencer_{i}' for i in inf_ids],
-    'category': np.random.choice(['Fitness', 'Nutrition', 'Lifestyle', 'Wellness'], n_inf),
-    'gender': np.random.choice(['M', 'F'], n_inf),
-    'follower_count': np.random.randint(10_000, 2_000_000, n_inf),
-    'platform': np.random.choice(['Instagram', 'YouTube', 'Twitter'], n_inf)
+    'category': rng.choice(['Fitness', 'Nutrition', 'Lifestyle', 'Wellness'], n_inf),
+    'gender': rng.choice(['M', 'F'], n_inf),
+    'follower_count': rng.integers(10_000, 2_000_000, n_inf),
+    'platform': rng.choice(['Instagram', 'YouTube', 'Twitter'], n_inf)
 })
 influencers.to_csv('data/influencers.csv', index=False)
+influencers.to_parquet('data/influencers.parquet', compression='zstd')
 
 # -------------------------------
 # 2) Posts table
 # -------------------------------
 n_posts = 100
 # Ensure every influencer has at least one post
-post_inf = list(inf_ids) + list(np.random.choice(inf_ids, n_posts - len(inf_ids)))
+post_inf = list(inf_ids) + list(rng.choice(inf_ids, n_posts - len(inf_ids)))
 
 start_date = datetime.today() - timedelta(days=90)
-dates = [start_date + timedelta(days=int(x)) for x in np.random.uniform(0, 90, len(post_inf))]
+dates = [start_date + timedelta(days=int(x)) for x in rng.uniform(0, 90, len(post_inf))]
 
 posts = pd.DataFrame({
     'post_id': range(1, len(post_inf) + 1),
@@ -47,15 +48,21 @@ platform_like_factor = {'Instagram': 0.08, 'YouTube': 0.06, 'Twitter': 0.04}
 platform_comment_factor = {'Instagram': 0.015, 'YouTube': 0.01, 'Twitter': 0.008}
 
 posts = posts.merge(influencers[['id', 'follower_count']], left_on='influencer_id', right_on='id')
-posts['reach'] = posts.apply(lambda r: int(r['follower_count'] * np.random.uniform(0.3, 0.7) * platform_reach_factor[r['platform']]), axis=1)
-posts['likes'] = (posts['reach'] * posts['platform'].map(platform_like_factor) * np.random.uniform(0.8, 1.2, len(posts))).astype(int)
-posts['comments'] = (posts['reach'] * posts['platform'].map(platform_comment_factor) * np.random.uniform(0.8, 1.2, len(posts))).astype(int)
+reach_factor = posts['platform'].map(platform_reach_factor).to_numpy()
+like_factor = posts['platform'].map(platform_like_factor).to_numpy()
+comment_factor = posts['platform'].map(platform_comment_factor).to_numpy()
+
+posts['reach'] = (posts['follower_count'].to_numpy() * rng.uniform(0.3, 0.7, len(posts)) * reach_factor).astype(np.int32)
+reach = posts['reach'].to_numpy()
+posts['likes'] = (reach * like_factor * rng.uniform(0.8, 1.2, len(posts))).astype(np.int32)
+posts['comments'] = (reach * comment_factor * rng.uniform(0.8, 1.2, len(posts))).astype(np.int32)
 
 # Engagement rate
 posts['engagement_rate'] = (posts['likes'] + posts['comments']) / posts['reach']
 posts.drop(columns=['id', 'follower_count'], inplace=True)
 
 posts.to_csv('data/posts.csv', index=False)
+posts.to_parquet('data/posts.parquet', compression='zstd')
 
 # -------------------------------
 # 3) Tracking table
@@ -63,46 +70,55 @@ posts.to_csv('data/posts.csv', index=False)
 n_users = 2000
 users = np.arange(1, n_users + 1)
 
-rows = []
-for _ in range(3000):
-    user = np.random.choice(users)
-    src = np.random.choice(['influencer', 'organic', 'paid_ad'], p=[0.3, 0.5, 0.2])
-    inf_id = np.random.choice(inf_ids) if src == 'influencer' else np.nan
-    product = np.random.choice(['Protein', 'Multivitamin', 'Snack', 'Supplement'])
-    date = start_date + timedelta(days=int(np.random.uniform(0, 90)))
-
-    order_prob = 0.05 if src == 'influencer' else (0.06 if src == 'paid_ad' else 0.015)
-    order_flag = np.random.binomial(1, order_prob)
-    revenue = order_flag * np.random.choice([499, 999, 1499, 1999])
-
-    campaign = f"camp_{np.random.randint(1, 6)}" if src != 'organic' else None
-
-    rows.append((src, campaign, inf_id, user, product, date, order_flag, revenue))
-
-tracking = pd.DataFrame(rows, columns=['source', 'campaign', 'influencer_id', 'user_id', 'product', 'date', 'orders', 'revenue'])
+n_tracking = 3000
+src_arr = rng.choice(['influencer', 'organic', 'paid_ad'], n_tracking, p=[0.3, 0.5, 0.2])
+user_arr = rng.choice(users, n_tracking)
+inf_arr = np.where(src_arr == 'influencer', rng.choice(inf_ids, n_tracking), np.nan)
+product_arr = rng.choice(['Protein', 'Multivitamin', 'Snack', 'Supplement'], n_tracking)
+date_arr = pd.Timestamp(start_date) + pd.to_timedelta(rng.uniform(0, 90, n_tracking).astype(int), unit='D')
+
+order_prob = np.select([src_arr == 'influencer', src_arr == 'paid_ad'], [0.05, 0.06], default=0.015)
+order_arr = rng.binomial(1, order_prob)
+revenue_arr = order_arr * rng.choice([499, 999, 1499, 1999], n_tracking)
+
+campaign_arr = np.char.add('camp_', rng.integers(1, 6, n_tracking).astype(str)).astype(object)
+campaign_arr[src_arr == 'organic'] = None
+
+tracking = pd.DataFrame({
+    'source': src_arr,
+    'campaign': campaign_arr,
+    'influencer_id': inf_arr,
+    'user_id': user_arr,
+    'product': product_arr,
+    'date': date_arr,
+    'orders': order_arr.astype(np.uint8),
+    'revenue': revenue_arr.astype(np.int32),
+})
 tracking['influencer_id'] = tracking['influencer_id'].astype('Int64')
 
 tracking.to_csv('data/tracking.csv', index=False)
+tracking.to_parquet('data/tracking.parquet', compression='zstd')
 
 # -------------------------------
 # 4) Payouts table
 # -------------------------------
 payouts = []
 for _, r in influencers.iterrows():
-    basis = np.random.choice(['post', 'order'], p=[0.6, 0.4])
+    basis = rng.choice(['post', 'order'], p=[0.6, 0.4])
     if basis == 'post':
-        rate = np.random.randint(2000, 20000)
+        rate = rng.integers(2000, 20000)
         num_posts = posts[posts['influencer_id'] == r['id']].shape[0]
         total = rate * num_posts
         orders_count = num_posts
     else:
-        rate = np.random.randint(50, 1000)
-        orders_count = tracking[(tracking['influencer_id'] == r['id']) & (tracking['source'] == 'influencer')]['orders'].sum()
+        rate = rng.integers(50, 1000)
+        orders_count = int(tracking[(tracking['influencer_id'] == r['id']) & (tracking['source'] == 'influencer')]['orders'].sum())
         total = rate * orders_count
 
     payouts.append((r['id'], basis, rate, orders_count, total))
 
 payouts_df = pd.DataFrame(payouts, columns=['influencer_id', 'basis', 'rate', 'orders', 'total_payout'])
 payouts_df.to_csv('data/payouts.csv', index=False)
+payouts_df.to_parquet('data/payouts.parquet', compression='zstd')
 
 print("✅ Data generated in 'data/' folder with engagement_rate and realistic variation")